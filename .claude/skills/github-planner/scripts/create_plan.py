@@ -3,46 +3,19 @@
 # ///
 """Create an implementation plan markdown file from a GitHub issue."""
 
-import argparse
-import re
+import os
 import sys
-from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
+USAGE = "usage: create_plan.py --issue ISSUE --title TITLE"
 
-def slugify(text: str) -> str:
-    """Convert text to URL-friendly slug."""
-    text = text.lower().strip()
-    text = re.sub(r"[^\w\s-]", "", text)
-    text = re.sub(r"[\s_]+", "-", text)
-    text = re.sub(r"-+", "-", text)
-    return text[:60].rstrip("-")
-
-
-def main():
-    parser = argparse.ArgumentParser(description="Create implementation plan file")
-    parser.add_argument("--issue", "-i", required=True, help="Issue number")
-    parser.add_argument("--title", "-t", required=True, help="Issue title for slug")
-    args = parser.parse_args()
+_OPTIONS = {"--issue": "issue", "-i": "issue", "--title": "title", "-t": "title"}
 
-    slug = slugify(args.title)
-    filename = f"{args.issue}-{slug}.md"
-
-    plans_dir = Path("private-docs/plans")
-    plans_dir.mkdir(parents=True, exist_ok=True)
-
-    filepath = plans_dir / filename
+# Built once at import; main only fills in the issue number and date
+_TEMPLATE = """# Implementation Plan: [TITLE]
 
-    if filepath.exists():
-        print(f"Plan file already exists: {filepath}", file=sys.stderr)
-        print(f"Path: {filepath}")
-        sys.exit(0)
-
-    today = datetime.now().strftime("%Y-%m-%d")
-
-    template = f"""# Implementation Plan: [TITLE]
-
-**Issue**: #{args.issue}
+**Issue**: #{issue}
 **Labels**: [labels]
 **Created**: [issue date]
 **Plan generated**: {today}
@@ -114,7 +87,105 @@ def main():
 - [Any ambiguities]
 """
 
-    filepath.write_text(template, encoding="utf-8")
+
+@lru_cache(maxsize=512)
+def slugify(text: str) -> str:
+    """Convert text to URL-friendly slug.
+
+    Single pass: word characters are kept, each run of whitespace,
+    underscores and hyphens becomes one hyphen, everything else is dropped.
+    """
+    chars = []
+    dash = False
+    for ch in text.lower().strip():
+        if ch.isspace() or ch in "_-":
+            if not dash:
+                chars.append("-")
+                dash = True
+        elif ch.isalnum():
+            chars.append(ch)
+            dash = False
+    return "".join(chars)[:60].rstrip("-")
+
+
+def _usage_error(message: str) -> None:
+    """Print usage and an error to stderr, then exit like argparse does."""
+    print(USAGE, file=sys.stderr)
+    print(f"create_plan.py: error: {message}", file=sys.stderr)
+    sys.exit(2)
+
+
+def parse_args(argv: list[str]) -> tuple[str, str]:
+    """Parse --issue/-i and --title/-t into (issue, title).
+
+    Hand-rolled instead of argparse, whose import and parser setup outweigh
+    the rest of this script's work.
+    """
+    values = {}
+    args = iter(argv)
+    for arg in args:
+        if arg in ("-h", "--help"):
+            print(USAGE)
+            print("\n  -i, --issue ISSUE  Issue number\n  -t, --title TITLE  Issue title for slug")
+            sys.exit(0)
+
+        if len(arg) > 2 and arg[:2] in _OPTIONS:
+            # Short option with its value attached: -i123 or -i=123
+            name, sep, value = arg[:2], "=", arg[2:].removeprefix("=")
+        else:
+            name, sep, value = arg.partition("=")
+        key = _OPTIONS.get(name)
+        if key is None:
+            _usage_error(f"unrecognized argument: {arg}")
+        if not sep:
+            value = next(args, None)
+            if value is None:
+                _usage_error(f"argument {name}: expected one argument")
+        values[key] = value
+
+    missing = [f"--{key}" for key in ("issue", "title") if key not in values]
+    if missing:
+        _usage_error(f"the following arguments are required: {', '.join(missing)}")
+    return values["issue"], values["title"]
+
+
+def _create_new(path: Path) -> int:
+    """Create path for writing, raising FileExistsError if it already exists.
+
+    O_EXCL makes the existence check and the create one atomic call. The
+    parent directory is only created when the first attempt finds it missing.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL
+    try:
+        return os.open(path, flags, 0o644)
+    except FileNotFoundError:
+        os.makedirs(path.parent, exist_ok=True)
+        return os.open(path, flags, 0o644)
+
+
+def main():
+    issue, title = parse_args(sys.argv[1:])
+    from datetime import date
+
+    today = date.today().isoformat()
+
+    slug = slugify(title)
+    filename = f"{issue}-{slug}.md"
+
+    plans_dir = Path("private-docs/plans")
+    filepath = plans_dir / filename
+
+    try:
+        fd = _create_new(filepath)
+    except FileExistsError:
+        print(f"Plan file already exists: {filepath}", file=sys.stderr)
+        print(f"Path: {filepath}")
+        sys.exit(0)
+
+    try:
+        os.write(fd, _TEMPLATE.format(issue=issue, today=today).encode())
+    finally:
+        os.close(fd)
     print(f"Path: {filepath}")
 
 
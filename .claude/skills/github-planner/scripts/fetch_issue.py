@@ -1,12 +1,78 @@
 # /// script
 # requires-python = ">=3.10"
+# dependencies = [
+#     "httpx>=0.27",
+#     "orjson>=3.9",
+# ]
 # ///
-"""Fetch GitHub issue details using gh CLI and output structured JSON."""
+"""Fetch GitHub issue details and output structured JSON.
+
+Talks to the GitHub API directly when GH_TOKEN or GITHUB_TOKEN is set, and
+falls back to the gh CLI otherwise.
+"""
 
 import json
+import os
 import re
 import subprocess
 import sys
+from pathlib import Path
+
+# Enable local imports when run via uv
+sys.path.insert(0, str(Path(__file__).parent))
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+USAGE = """Usage: fetch_issue.py <issue_url_or_number> [<issue_url_or_number> ...]
+Examples:
+  fetch_issue.py 123
+  fetch_issue.py https://github.com/owner/repo/issues/123
+  fetch_issue.py owner/repo#123
+  fetch_issue.py 123 456 owner/repo#789
+"""
+
+# Alternatives are tried in order: full URL, owner/repo#number, bare number
+_ISSUE_REF_RE = re.compile(
+    r"https?://github\.com/(?P<url_repo>[^/]+/[^/]+)/issues/(?P<url_number>\d+)"
+    r"|(?P<short_repo>[^/]+/[^#]+)#(?P<short_number>\d+)"
+    r"|#?(?P<number>\d+)$",
+    re.ASCII,
+)
+
+# Selects only the fields format_output consumes
+_ISSUE_FIELDS = """
+fragment IssueFields on Issue {
+  number title body state createdAt updatedAt
+  author { login }
+  labels(first: 100) { nodes { name } }
+  assignees(first: 100) { nodes { login } }
+  milestone { title }
+  comments(first: 100, after: $cursor) {
+    pageInfo { hasNextPage endCursor }
+    nodes { author { login } body createdAt }
+  }
+}
+"""
+_ISSUE_QUERY = """
+query($owner: String!, $name: String!, $number: Int!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    issue(number: $number) { ...IssueFields }
+  }
+}
+""" + _ISSUE_FIELDS
+
+_ISSUE_VIEW_FIELDS = "number,title,body,state,labels,assignees,milestone,createdAt,updatedAt,author,comments,url"
 
 
 def parse_issue_input(raw: str) -> tuple[str | None, str]:
@@ -19,57 +85,173 @@ def parse_issue_input(raw: str) -> tuple[str | None, str]:
     """
     raw = raw.strip()
 
-    # Full URL
-    url_match = re.match(
-        r"https?://github\.com/([^/]+/[^/]+)/issues/(\d+)", raw
-    )
-    if url_match:
-        return url_match.group(1), url_match.group(2)
-
-    # owner/repo#number
-    short_match = re.match(r"([^/]+/[^#]+)#(\d+)", raw)
-    if short_match:
-        return short_match.group(1), short_match.group(2)
-
-    # Just a number, optionally with #
-    num_match = re.match(r"#?(\d+)$", raw)
-    if num_match:
-        return None, num_match.group(1)
+    match = _ISSUE_REF_RE.match(raw)
+    if match:
+        if match["url_number"]:
+            return match["url_repo"], match["url_number"]
+        if match["short_number"]:
+            return match["short_repo"], match["short_number"]
+        return None, match["number"]
 
     print(f"Error: Cannot parse issue reference: {raw}", file=sys.stderr)
     sys.exit(1)
 
 
-def fetch_issue(repo: str | None, number: str) -> dict:
-    """Fetch issue details via gh CLI."""
-    fields = "number,title,body,state,labels,assignees,milestone,createdAt,updatedAt,author,comments"
+def _token() -> str | None:
+    """Return the GitHub token from the environment, if any."""
+    return os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
 
-    cmd = ["gh", "issue", "view", number, "--json", fields]
-    if repo:
-        cmd.extend(["-R", repo])
 
+def _run_gh(args: list[str]) -> dict:
+    """Run a gh CLI command and parse its JSON output."""
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        result = subprocess.run(["gh", *args], capture_output=True, check=True)
     except FileNotFoundError:
         print("Error: gh CLI not found. Install from https://cli.github.com/", file=sys.stderr)
         sys.exit(1)
     except subprocess.CalledProcessError as e:
-        print(f"Error fetching issue: {e.stderr.strip()}", file=sys.stderr)
+        print(f"Error fetching issue: {e.stderr.decode(errors='replace').strip()}", file=sys.stderr)
         sys.exit(1)
 
-    return json.loads(result.stdout)
+    # Parse the raw bytes; skips decoding the whole payload to str first
+    return _loads(result.stdout)
+
+
+def _gh_graphql(query: str, variables: dict) -> dict:
+    """Run a GraphQL query via gh CLI and return its data."""
+    args = ["api", "graphql", "-f", f"query={query}"]
+    for key, value in variables.items():
+        # -F types integers; -f passes strings verbatim
+        flag = "-F" if isinstance(value, int) else "-f"
+        args += [flag, f"{key}={value}"]
+    return _run_gh(args)["data"]
+
+
+def _from_graphql(issue: dict, comments: list[dict]) -> dict:
+    """Map a GraphQL issue node onto the `gh issue view --json` shape."""
+    return {
+        **issue,
+        "labels": issue["labels"]["nodes"],
+        "assignees": issue["assignees"]["nodes"],
+        "comments": comments,
+    }
+
+
+def _fetch_gh(repo: str | None, number: str) -> dict:
+    """Fetch issue details via gh CLI.
+
+    With an explicit repo, only the consumed fields are requested through
+    gh api graphql. Bare numbers use gh issue view, so gh picks the repo
+    exactly as it always has (placeholders in gh api may resolve differently).
+    """
+    if repo is None:
+        return _run_gh(["issue", "view", number, "--json", _ISSUE_VIEW_FIELDS])
+
+    owner, name = repo.split("/", 1)
+    variables = {"owner": owner, "name": name, "number": int(number)}
+
+    comments = []
+    while True:
+        issue = _gh_graphql(_ISSUE_QUERY, variables)["repository"]["issue"]
+        comments.extend(issue["comments"]["nodes"])
+        page_info = issue["comments"]["pageInfo"]
+        if not page_info["hasNextPage"]:
+            break
+        variables["cursor"] = page_info["endCursor"]
+
+    return _from_graphql(issue, comments)
+
+
+def fetch_issue(repo: str | None, number: str) -> dict:
+    """Fetch issue details via the REST API, or via gh CLI without a token.
+
+    Bare issue numbers skip the REST path even when a token is set: they go
+    to gh issue view, so the repo is the one gh selects, as before.
+    """
+    token = _token() if repo else None
+    if token:
+        # Deferred: httpx and asyncio take ~60 ms to import
+        import github_api
+
+        try:
+            return github_api.fetch_issue(repo, number, token)
+        except github_api.GhError as e:
+            print(f"Error fetching issue: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    return _fetch_gh(repo, number)
+
+
+def _batch_query(refs: list[tuple[str, str]]) -> tuple[str, dict]:
+    """Build one GraphQL query with an aliased issue lookup per (repo, number)."""
+    params = ["$cursor: String"]
+    selections = []
+    variables = {}
+    for i, (repo, number) in enumerate(refs):
+        params.append(f"$o{i}: String!, $n{i}: String!, $i{i}: Int!")
+        selections.append(
+            f"  r{i}: repository(owner: $o{i}, name: $n{i}) {{ issue(number: $i{i}) {{ ...IssueFields }} }}"
+        )
+        variables[f"o{i}"], variables[f"n{i}"] = repo.split("/", 1)
+        variables[f"i{i}"] = int(number)
+
+    query = f"query({', '.join(params)}) {{\n" + "\n".join(selections) + "\n}\n" + _ISSUE_FIELDS
+    return query, variables
+
+
+def fetch_issues(refs: list[tuple[str | None, str]]) -> list[dict]:
+    """Fetch several issues in one round trip with an aliased GraphQL query.
+
+    Issues with more than one page of comments are completed via fetch_issue.
+    The first bare number is fetched with gh issue view, and the repo gh chose
+    for it is used for the other bare numbers in the batch.
+    """
+    known = {}
+    bare = next((i for i, (repo, _) in enumerate(refs) if repo is None), None)
+    if bare is not None:
+        known[bare] = _fetch_gh(None, refs[bare][1])
+        # https://github.com/owner/repo/issues/N (or /pull/N for a PR number)
+        base_repo = "/".join(known[bare]["url"].split("/")[3:5])
+        refs = [(repo or base_repo, number) for repo, number in refs]
+
+    pending = [(i, ref) for i, ref in enumerate(refs) if i not in known]
+    if not pending:
+        return [known[bare]]
+
+    token = _token()
+    query, variables = _batch_query([ref for _, ref in pending])
+    if token:
+        # Deferred: httpx and asyncio take ~60 ms to import
+        import github_api
+
+        try:
+            data = github_api.graphql(query, variables, token)
+        except github_api.GhError as e:
+            print(f"Error fetching issues: {e}", file=sys.stderr)
+            sys.exit(1)
+    else:
+        data = _gh_graphql(query, variables)
+
+    for alias, (i, (repo, number)) in enumerate(pending):
+        issue = data[f"r{alias}"]["issue"]
+        if issue["comments"]["pageInfo"]["hasNextPage"]:
+            known[i] = fetch_issue(repo, number)
+        else:
+            known[i] = _from_graphql(issue, issue["comments"]["nodes"])
+    return [known[i] for i in range(len(refs))]
 
 
 def format_output(data: dict) -> dict:
     """Format issue data for consumption."""
-    labels = [lb["name"] for lb in data.get("labels", [])]
-    comments = []
-    for c in data.get("comments", []):
-        comments.append({
-            "author": c.get("author", {}).get("login", "unknown"),
+    labels = [lb["name"] for lb in data.get("labels") or ()]
+    comments = [
+        {
+            "author": (c.get("author") or {}).get("login", "unknown"),
             "body": c.get("body", ""),
             "createdAt": c.get("createdAt", ""),
-        })
+        }
+        for c in data.get("comments") or ()
+    ]
 
     return {
         "number": data["number"],
@@ -77,8 +259,8 @@ def format_output(data: dict) -> dict:
         "body": data.get("body", ""),
         "state": data.get("state", ""),
         "labels": labels,
-        "author": data.get("author", {}).get("login", "unknown"),
-        "assignees": [a["login"] for a in data.get("assignees", [])],
+        "author": (data.get("author") or {}).get("login", "unknown"),
+        "assignees": [a["login"] for a in data.get("assignees") or ()],
         "milestone": (data.get("milestone") or {}).get("title"),
         "createdAt": data.get("createdAt", ""),
         "updatedAt": data.get("updatedAt", ""),
@@ -89,17 +271,15 @@ def format_output(data: dict) -> dict:
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: fetch_issue.py <issue_url_or_number>", file=sys.stderr)
-        print("Examples:", file=sys.stderr)
-        print("  fetch_issue.py 123", file=sys.stderr)
-        print("  fetch_issue.py https://github.com/owner/repo/issues/123", file=sys.stderr)
-        print("  fetch_issue.py owner/repo#123", file=sys.stderr)
+        sys.stderr.write(USAGE)
         sys.exit(1)
 
-    repo, number = parse_issue_input(sys.argv[1])
-    data = fetch_issue(repo, number)
-    output = format_output(data)
-    print(json.dumps(output, indent=2, ensure_ascii=False))
+    refs = [parse_issue_input(arg) for arg in sys.argv[1:]]
+    if len(refs) == 1:
+        output = format_output(fetch_issue(*refs[0]))
+    else:
+        output = [format_output(data) for data in fetch_issues(refs)]
+    print(_dumps(output))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,230 @@
+"""Async GitHub REST client for fetching issues with ETag revalidation.
+
+Kept separate from fetch_issue.py so the gh CLI path does not pay for
+importing httpx and asyncio.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import httpx
+
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+API_URL = "https://api.github.com"
+PER_PAGE = 100
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "screenize" / "gh-issues"
+
+
+class GhError(Exception):
+    """Raised when a GitHub API request fails."""
+
+
+class GhNotFound(GhError):
+    """Raised when the repository or issue does not exist."""
+
+
+class GhRateLimited(GhError):
+    """Raised when the API rate limit is exhausted."""
+
+
+def _headers(token: str) -> dict:
+    """Return the request headers for an authenticated API call."""
+    return {
+        "Authorization": f"Bearer {token}",
+        "Accept": "application/vnd.github+json",
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
+
+
+def _async_client(token: str) -> httpx.AsyncClient:
+    """Create a keep-alive client for the REST API."""
+    return httpx.AsyncClient(
+        base_url=API_URL,
+        headers=_headers(token),
+        limits=httpx.Limits(max_keepalive_connections=8),
+        timeout=10.0,
+    )
+
+
+def _cache_path(repo: str, number: str) -> Path:
+    """Return the response cache file for an issue."""
+    return CACHE_DIR / f"{repo.replace('/', '_')}_{number}.json"
+
+
+def _load_cache(path: Path) -> dict:
+    """Load cached responses keyed by request URL, or an empty cache."""
+    try:
+        return _loads(path.read_bytes())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(path: Path, cache: dict) -> None:
+    """Atomically write the response cache; failures are not fatal.
+
+    The cache may hold private-repo issue bodies, so it is readable by the
+    owner only (mkstemp creates the file with mode 0600).
+    """
+    try:
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    except OSError:
+        return
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(json.dumps(cache, ensure_ascii=False).encode())
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+def _raise_for_status(response: httpx.Response, url: str) -> None:
+    """Map an error response to GhNotFound, GhRateLimited or GhError."""
+    if response.status_code == 404:
+        raise GhNotFound(f"Not found: {url}")
+    if response.status_code in (403, 429) and response.headers.get("X-RateLimit-Remaining") == "0":
+        raise GhRateLimited("GitHub API rate limit exceeded")
+    if response.is_error:
+        raise GhError(f"HTTP {response.status_code} for {url}: {response.text.strip()}")
+
+
+async def _get(
+    client: httpx.AsyncClient, cache: dict, url: str, params: dict | None = None, revalidate: bool = True
+) -> tuple[list | dict, dict]:
+    """GET a REST endpoint as (json, links), revalidating cached responses by ETag.
+
+    A 304 Not Modified reply carries no body and does not count against the
+    rate limit, so unchanged resources are served from the cache. With
+    revalidate=False the cache is bypassed (but still refreshed).
+    """
+    key = str(httpx.URL(url, params=params))
+    cached = cache.get(key) if revalidate else None
+    headers = {"If-None-Match": cached["etag"]} if cached else None
+
+    try:
+        response = await client.get(url, params=params, headers=headers)
+    except httpx.HTTPError as e:
+        raise GhError(f"Request to {url} failed: {e}") from e
+
+    if response.status_code == 304 and cached:
+        return cached["data"], cached["links"]
+    _raise_for_status(response, url)
+
+    data, links = _loads(response.content), response.links
+    if etag := response.headers.get("ETag"):
+        cache[key] = {"etag": etag, "data": data, "links": links}
+    return data, links
+
+
+def _from_rest(issue: dict, comments: list[dict]) -> dict:
+    """Map REST payloads onto the `gh issue view --json` shape."""
+    return {
+        "number": issue["number"],
+        "title": issue["title"],
+        "body": issue.get("body") or "",
+        "state": (issue.get("state") or "").upper(),
+        "labels": issue.get("labels", []),
+        "assignees": issue.get("assignees", []),
+        "milestone": issue.get("milestone"),
+        "createdAt": issue.get("created_at", ""),
+        "updatedAt": issue.get("updated_at", ""),
+        "author": issue.get("user") or {},
+        "comments": [
+            {
+                "author": c.get("user") or {},
+                "body": c.get("body") or "",
+                "createdAt": c.get("created_at", ""),
+            }
+            for c in comments
+        ],
+    }
+
+
+async def _fetch_comments(
+    client: httpx.AsyncClient, cache: dict, url: str, revalidate: bool = True
+) -> list[dict]:
+    """Fetch all comment pages, requesting pages after the first concurrently."""
+    first_page, links = await _get(client, cache, url, params={"per_page": PER_PAGE}, revalidate=revalidate)
+    comments = list(first_page)
+
+    last = links.get("last")
+    if last:
+        last_page = int(httpx.URL(last["url"]).params["page"])
+        pages = await asyncio.gather(*(
+            _get(client, cache, url, params={"per_page": PER_PAGE, "page": page}, revalidate=revalidate)
+            for page in range(2, last_page + 1)
+        ))
+        for page_comments, _ in pages:
+            comments.extend(page_comments)
+
+    return comments
+
+
+async def _fetch_issue(repo: str, number: str, token: str) -> dict:
+    """Fetch issue details and comments concurrently."""
+    cache_path = _cache_path(repo, number)
+    cache = _load_cache(cache_path)
+
+    url = f"/repos/{repo}/issues/{number}"
+    async with _async_client(token) as client:
+        (issue, _), comments = await asyncio.gather(
+            _get(client, cache, url),
+            _fetch_comments(client, cache, f"{url}/comments"),
+        )
+
+        # ETags cover the page body, not its Link header: an unchanged first
+        # page can 304 with stale links that miss newly added pages. The
+        # issue's comment count exposes that, so refetch without the cache.
+        if len(comments) != issue.get("comments", len(comments)):
+            comments = await _fetch_comments(client, cache, f"{url}/comments", revalidate=False)
+
+    _save_cache(cache_path, cache)
+    return _from_rest(issue, comments)
+
+
+def fetch_issue(repo: str, number: str, token: str) -> dict:
+    """Fetch issue details in the `gh issue view --json` shape.
+
+    Raises GhError (or a subclass) when the request fails.
+    """
+    return asyncio.run(_fetch_issue(repo, number, token))
+
+
+def graphql(query: str, variables: dict, token: str) -> dict:
+    """Run a GraphQL query and return its data.
+
+    Raises GhError (or a subclass) when the request or the query fails.
+    """
+    try:
+        response = httpx.post(
+            f"{API_URL}/graphql",
+            json={"query": query, "variables": variables},
+            headers=_headers(token),
+            timeout=10.0,
+        )
+    except httpx.HTTPError as e:
+        raise GhError(f"GraphQL request failed: {e}") from e
+    _raise_for_status(response, "/graphql")
+
+    payload = _loads(response.content)
+    errors = payload.get("errors")
+    if errors:
+        message = "; ".join(e.get("message", "") for e in errors)
+        types = {e.get("type") for e in errors}
+        if "RATE_LIMITED" in types:
+            raise GhRateLimited(message)
+        if "NOT_FOUND" in types:
+            raise GhNotFound(message)
+        raise GhError(message)
+    return payload["data"]